@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def make_sample(i, start_ts):
+    return {"timestamp": start_ts + i, "temperature": 20 + i % 10, "humidity": 45.0, "speed": i % 100, "remaining": i}
+
+
+async def post_single(client, device_id, samples, start_ts):
+    for i in range(samples):
+        response = await client.post(f"/devices/{device_id}/data", json={"status": "data", **make_sample(i, start_ts)})
+        await response.read()
+        assert response.status == 200
+
+
+async def post_batches(client, device_id, samples, start_ts, batch_size):
+    for first in range(0, samples, batch_size):
+        batch = [make_sample(i, start_ts) for i in range(first, min(first + batch_size, samples))]
+        response = await client.post(f"/devices/{device_id}/data", json={"status": "batch", "samples": batch})
+        await response.read()
+        assert response.status == 200, await response.text()
+
+
+async def run(samples, batch_sizes):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    start_ts = time.time() - samples
+    try:
+        runs = [("single", lambda device_id: post_single(client, device_id, samples, start_ts))]
+        for size in batch_sizes:
+            runs.append((f"batch {size}", lambda device_id, size=size: post_batches(client, device_id, samples, start_ts, size)))
+        results = []
+        for name, post in runs:
+            device_id = name.replace(" ", "-")
+            start = time.perf_counter()
+            await post(device_id)
+            elapsed = time.perf_counter() - start
+            stored = len(dashboard.get_device(device_id).session_data)
+            results.append((name, elapsed, stored))
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+    single_rate = samples / results[0][1]
+    for name, elapsed, stored in results:
+        rate = samples / elapsed
+        print(f"{name:<12} {elapsed:7.2f}s   {rate:10,.0f} samples/s   {rate / single_rate:6.1f}x   ({stored} stored)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest throughput: one sample per POST vs batched uploads")
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.samples, args.batch_sizes))
@@ -0,0 +1,55 @@
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def make_samples(count):
+    rng = random.Random(3)
+    return [{"status": "data", "public_ip": "198.51.100.23", "temperature": round(rng.uniform(18, 30), 1),
+             "humidity": round(rng.uniform(30, 70), 1), "speed": rng.randint(0, 100), "remaining": count - i}
+            for i in range(count)]
+
+
+def codecs():
+    pack_sample = dashboard.SAMPLE_STRUCT.pack
+    yield ("json", lambda s: json.dumps(s).encode(), json.loads)
+    if dashboard.msgpack is not None:
+        yield ("msgpack", dashboard.msgpack.packb, dashboard.msgpack.unpackb)
+    yield ("struct", lambda s: pack_sample(round(s["temperature"] * 100), round(s["humidity"] * 100), s["speed"], s["remaining"]),
+           lambda body: dashboard.unpack_samples(body, dashboard.SAMPLE_STRUCT, False)[0])
+
+
+def run(count, repeat):
+    samples = make_samples(count)
+    print(f"{count} samples, best of {repeat}")
+    print(f"{'format':<10} {'bytes/sample':>12} {'encode':>12} {'decode':>12}")
+    for name, encode, decode in codecs():
+        bodies = [encode(s) for s in samples]
+        encode_s = min(timeit.repeat(lambda: [encode(s) for s in samples], number=1, repeat=repeat)) / count
+        decode_s = min(timeit.repeat(lambda: [decode(b) for b in bodies], number=1, repeat=repeat)) / count
+        print(f"{name:<10} {sum(map(len, bodies)) / count:12.1f} {encode_s * 1e6:9.2f} us {decode_s * 1e6:9.2f} us")
+
+    batch = [dict(s, timestamp=1_700_000_000 + i) for i, s in enumerate(samples)]
+    json_batch = json.dumps({"status": "batch", "samples": [{k: s[k] for k in ("timestamp", *dashboard.METRIC_FIELDS)} for s in batch]}).encode()
+    struct_batch = b"".join(dashboard.BATCH_SAMPLE_STRUCT.pack(s["timestamp"], round(s["temperature"] * 100), round(s["humidity"] * 100), s["speed"], s["remaining"]) for s in batch)
+    json_decode = min(timeit.repeat(lambda: json.loads(json_batch), number=1, repeat=repeat)) / count
+    struct_decode = min(timeit.repeat(lambda: dashboard.unpack_samples(struct_batch, dashboard.BATCH_SAMPLE_STRUCT, True), number=1, repeat=repeat)) / count
+    print(f"batch json   {len(json_batch) / count:8.1f} B/sample, decode {json_decode * 1e6:6.2f} us/sample")
+    print(f"batch struct {len(struct_batch) / count:8.1f} B/sample, decode {struct_decode * 1e6:6.2f} us/sample")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bytes and CPU per sample for the /data body formats")
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.samples, args.repeat)
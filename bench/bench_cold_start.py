@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mib(pid):
+    # Current and peak resident set of the server process (Linux)
+    fields = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            fields[key] = value.strip()
+    return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+
+
+def request(url, data=None):
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"} if body else {})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return response.status, response.read()
+
+
+def first_report(base_url):
+    # A short session, then the time until the PDF is in hand (job polling included)
+    request(f"{base_url}/setup", {"authCode": 123, "runtime": 60})
+    for status in ("arduino_ready", "start"):
+        request(f"{base_url}/data", {"status": status, "public_ip": "Unknown"})
+    for i in range(20):
+        request(f"{base_url}/data", {"status": "data", "public_ip": "Unknown", "temperature": 21.5,
+                                     "humidity": 40.0, "speed": i, "remaining": 60 - i})
+    start = time.perf_counter()
+    status, body = request(f"{base_url}/download_pdf")
+    while status == 202:
+        time.sleep(0.05)
+        status, body = request(base_url + json.loads(body)["poll"])
+    return time.perf_counter() - start
+
+
+def cold_start(script, with_report, settle):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PORT=str(port), LOG_LEVEL="WARNING",
+                   SESSION_LOG_PATH=os.path.join(tmp, "session_log.jsonl"), REPORT_DIR=os.path.join(tmp, "reports"))
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, script], cwd=tmp, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                try:
+                    request(base_url + "/")
+                    break
+                except (urllib.error.URLError, ConnectionError):
+                    if server.poll() is not None:
+                        raise RuntimeError(f"{script} exited with {server.returncode}")
+                    time.sleep(0.005)
+            first_request = time.perf_counter() - start
+            rss, _ = rss_mib(server.pid)
+            report = None
+            if with_report:
+                # Give a background preload the head start it would get in production
+                time.sleep(settle)
+                report = first_report(base_url)
+            return first_request, rss, report
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process start to first served request, and baseline RSS")
+    parser.add_argument("--script", default=os.path.join(REPO, "dashboard.py"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--report", action="store_true", help="also time the first PDF download")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds between first request and first PDF")
+    args = parser.parse_args()
+
+    results = [cold_start(args.script, args.report, args.settle) for _ in range(args.runs)]
+    print(f"{args.script}, {args.runs} runs (medians)")
+    print(f"time to first request  {statistics.median(r[0] for r in results) * 1000:7.0f} ms")
+    print(f"baseline RSS           {statistics.median(r[1] for r in results):7.1f} MiB")
+    if args.report:
+        print(f"first PDF download     {statistics.median(r[2] for r in results) * 1000:7.0f} ms")
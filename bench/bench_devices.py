@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.helpers import percentile, rss_mb
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+async def run_device(client, index, duration, interval, latencies):
+    device_id = f"unit-{index:04d}"
+    public_ip = f"198.51.{index // 250}.{index % 250 + 1}"
+    await client.post(f"/devices/{device_id}/setup", json={"authCode": 100 + index % 900, "runtime": int(duration)})
+    for status in ("arduino_ready", "check_auth", "start"):
+        await (await client.post(f"/devices/{device_id}/data", json={"status": status, "public_ip": public_ip})).read()
+    # Spread the devices over the first interval so they don't post in lockstep
+    await asyncio.sleep(interval * (index % 100) / 100)
+    deadline = time.perf_counter() + duration
+    sample = 0
+    while time.perf_counter() < deadline:
+        body = {
+            "status": "data",
+            "public_ip": public_ip,
+            "temperature": 20 + sample % 10,
+            "humidity": 45.0,
+            "speed": sample % 100,
+            "remaining": max(int(duration) - sample, 0)
+        }
+        start = time.perf_counter()
+        response = await client.post(f"/devices/{device_id}/data", json=body)
+        await response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"{device_id}: sample rejected with {response.status}")
+        sample += 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+async def run(device_count, duration, interval):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    baseline_rss = rss_mb()
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    latencies = []
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_device(client, i, duration, interval, latencies) for i in range(device_count)))
+        elapsed = time.perf_counter() - start
+        listing = await (await client.get("/devices")).json()
+        caches = dashboard.gps_cache_summary()
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+    session_bytes = [device["session_bytes"] for device in listing["devices"] if device["samples"]]
+    print(f"{device_count} devices at {1 / interval:.1f} Hz for {duration:.0f}s: {len(latencies)} samples "
+          f"in {elapsed:.1f}s ({len(latencies) / elapsed:,.0f} samples/s)")
+    print(f"ingest latency  mean {statistics.mean(latencies) * 1000:7.3f} ms   "
+          f"p50 {percentile(latencies, 50) * 1000:7.3f} ms   p99 {percentile(latencies, 99) * 1000:7.3f} ms   "
+          f"max {max(latencies) * 1000:7.3f} ms")
+    print(f"session store   {statistics.mean(session_bytes):,.0f} B/device mean, {sum(session_bytes) / 1024:,.0f} KiB total")
+    print(f"peak RSS        {rss_mb():.1f} MiB ({rss_mb() - baseline_rss:.1f} MiB above idle, "
+          f"{(rss_mb() - baseline_rss) * 1024 / device_count:.1f} KiB/device)")
+    for name, cache in caches.items():
+        print(f"{name} cache       {cache['hits']} hits, {cache['misses']} misses, hit ratio {cache['hit_ratio']:.2f}, "
+              f"{cache['size']}/{cache['maxsize']} entries")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Many simulated Arduinos posting to one dashboard process")
+    parser.add_argument("--devices", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of sampling per device")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples per device")
+    args = parser.parse_args()
+    dashboard.MAX_DEVICES = max(dashboard.MAX_DEVICES, args.devices + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.devices, args.duration, args.interval))
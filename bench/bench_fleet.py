@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.helpers import percentile, rss_mb
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+
+    async def call(self, op, request):
+        start = time.perf_counter()
+        response = await request
+        body = await response.read()
+        self.latencies.setdefault(op, []).append(time.perf_counter() - start)
+        key = f"{op} {response.status}"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        return response, body
+
+    def summary(self, elapsed):
+        ops = {}
+        for op, values in sorted(self.latencies.items()):
+            ops[op] = {
+                "count": len(values),
+                "per_second": round(len(values) / elapsed, 1),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p90_ms": round(percentile(values, 90) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(max(values) * 1000, 3)
+            }
+        return ops
+
+
+def device_address(index):
+    return f"/devices/unit-{index:04d}", f"198.51.{index // 250}.{index % 250 + 1}"
+
+
+async def connect_device(client, recorder, index, duration):
+    # One Arduino: the operator sets it up, then arduino_ready -> check_auth -> start
+    base, public_ip = device_address(index)
+    await recorder.call("setup", client.post(f"{base}/setup", json={"authCode": 100 + index % 900, "runtime": int(duration)}))
+    await recorder.call("arduino_ready", client.post(f"{base}/data", json={"status": "arduino_ready", "public_ip": public_ip}))
+    response, body = await recorder.call("check_auth", client.post(f"{base}/data", json={"status": "check_auth", "public_ip": public_ip}))
+    if json.loads(body).get("status") != "auth_code":
+        raise RuntimeError(f"{base}: no auth code after setup")
+    await recorder.call("start", client.post(f"{base}/data", json={"status": "start", "public_ip": public_ip}))
+
+
+async def run_device(client, recorder, index, duration, interval):
+    # ... then data at a fixed rate and a final stopped
+    base, public_ip = device_address(index)
+    # Spread the devices over the first interval so they don't post in lockstep
+    await asyncio.sleep(interval * (index % 100) / 100)
+    deadline = time.perf_counter() + duration
+    sample = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response, _ = await recorder.call("data", client.post(f"{base}/data", json={
+            "status": "data",
+            "public_ip": public_ip,
+            "temperature": 20 + sample % 10,
+            "humidity": 45.0,
+            "speed": sample % 100,
+            "remaining": max(int(duration) - sample, 0)
+        }))
+        if response.status != 200:
+            raise RuntimeError(f"{base}: sample rejected with {response.status}")
+        sample += 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    await recorder.call("stopped", client.post(f"{base}/data", json={"status": "stopped", "public_ip": public_ip}))
+
+
+async def run_poller(client, recorder, index, device_count, stop, interval, wait):
+    # One open dashboard tab doing what fetchData() does: GET /data?since=<seq>, merging deltas
+    device_id = f"unit-{index % device_count:04d}"
+    since = None
+    while not stop.is_set():
+        start = time.perf_counter()
+        params = {} if since is None else {"since": since}
+        if wait:
+            params["wait"] = wait
+        response, body = await recorder.call("poll_long" if wait else "poll", client.get(f"/devices/{device_id}/data", params=params))
+        if response.status == 200:
+            since = json.loads(body)["seq"]
+        if not wait:
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+async def run(args):
+    stub_runner, base_url = await start_stub_server(args.upstream_delay)
+    point_dashboard_at(dashboard, base_url)
+    baseline_rss = rss_mb()
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    recorder = Recorder()
+    stop = asyncio.Event()
+    try:
+        await asyncio.gather(*(connect_device(client, recorder, i, args.duration) for i in range(args.devices)))
+        start = time.perf_counter()
+        pollers = [asyncio.create_task(run_poller(client, recorder, i, args.devices, stop, args.poll_interval, args.wait))
+                   for i in range(args.pollers)]
+        await asyncio.gather(*(run_device(client, recorder, i, args.duration, args.interval) for i in range(args.devices)))
+        stop.set()
+        # Long-pollers are parked until the next change; don't let them hold up the report
+        for task in pollers:
+            task.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "elapsed_s": round(elapsed, 3),
+        "operations": recorder.summary(elapsed),
+        "statuses": dict(sorted(recorder.statuses.items())),
+        "rss_mib": {"idle": round(baseline_rss, 1), "peak": round(rss_mb(), 1),
+                    "per_device_kib": round((rss_mb() - baseline_rss) * 1024 / max(args.devices, 1), 1)}
+    }
+
+
+def compare(result, baseline):
+    # One line per operation: throughput and tail latency relative to an earlier run
+    print(f"vs {baseline.get('commit')}:", file=sys.stderr)
+    for op, now in result["operations"].items():
+        before = baseline.get("operations", {}).get(op)
+        if not before:
+            continue
+        print(f"  {op:<14} {now['per_second']:>9.1f}/s ({(now['per_second'] / before['per_second'] - 1) * 100:+6.1f}%)   "
+              f"p99 {now['p99_ms']:8.3f} ms ({(now['p99_ms'] / before['p99_ms'] - 1) * 100:+6.1f}%)", file=sys.stderr)
+    print(f"  peak RSS       {result['rss_mib']['peak']:.1f} MiB (was {baseline['rss_mib']['peak']:.1f})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated Arduino fleet plus dashboard pollers against an in-process app")
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--pollers", type=int, default=100, help="dashboard tabs polling GET /data, spread over the devices")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of sampling per device")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples per device")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls (ignored with --wait)")
+    parser.add_argument("--wait", type=float, default=0, help="long-poll with ?wait= instead of polling on a timer")
+    parser.add_argument("--upstream-delay", type=float, default=0.0, help="added latency of the stub geolocation/VPN upstreams")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument("--compare", help="JSON result of an earlier run to diff against")
+    args = parser.parse_args()
+    dashboard.MAX_DEVICES = max(dashboard.MAX_DEVICES, args.devices + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        result = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+from aiohttp import ClientSession
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.helpers import percentile
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+async def sample_fresh_sessions(base_url, ip_address):
+    # What check_vpn + get_gps_from_ip used to do: a new session (and connection) per lookup
+    async with ClientSession() as session:
+        async with session.get(f"{base_url}/json/{ip_address}?fields=status,message,proxy,hosting,org", timeout=5) as response:
+            await response.json()
+    async with ClientSession() as session:
+        async with session.post(f"{base_url}/geolocate?key=stub", json={"considerIp": True}) as response:
+            await response.json()
+
+
+async def sample_shared_session(ip_address):
+    dashboard.vpn_cache.clear()
+    await dashboard.check_vpn(ip_address)
+    await dashboard.get_gps_from_ip(ip_address)
+
+
+def summarize(name, durations):
+    print(f"{name:<16} mean {statistics.mean(durations) * 1000:7.3f} ms   "
+          f"p50 {statistics.median(durations) * 1000:7.3f} ms   p99 {percentile(durations, 99) * 1000:7.3f} ms")
+    return statistics.mean(durations)
+
+
+async def run(samples):
+    runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    try:
+        fresh = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            await sample_fresh_sessions(base_url, "203.0.113.7")
+            fresh.append(time.perf_counter() - start)
+
+        dashboard.http_session = dashboard.create_http_session()
+        shared = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            await sample_shared_session("203.0.113.7")
+            shared.append(time.perf_counter() - start)
+        await dashboard.close_http_session(None)
+    finally:
+        await runner.cleanup()
+
+    print(f"{samples} telemetry samples against local stub at {base_url}")
+    fresh_mean = summarize("fresh session", fresh)
+    shared_mean = summarize("shared session", shared)
+    print(f"per-sample latency reduced by {(1 - shared_mean / fresh_mean) * 100:.1f}% "
+          f"(plain HTTP stub; real upstreams also save the TLS handshake)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-sample lookup latency: fresh vs shared ClientSession")
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.samples))
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.helpers import percentile
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+async def run(samples, upstream_delay, interval):
+    stub_runner, base_url = await start_stub_server(delay=upstream_delay)
+    point_dashboard_at(dashboard, base_url)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    try:
+        latencies = []
+        for i in range(samples):
+            body = {
+                "status": "data",
+                "public_ip": f"198.51.100.{i % 4}",
+                "temperature": 21.5,
+                "humidity": 40.0,
+                "speed": 50,
+                "remaining": samples - i
+            }
+            start = time.perf_counter()
+            response = await client.post('/data', json=body)
+            await response.read()
+            latencies.append(time.perf_counter() - start)
+            if interval:
+                await asyncio.sleep(interval)
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+    print(f"{samples} data POSTs, upstream delay {upstream_delay * 1000:.0f} ms")
+    print(f"ingest latency  mean {statistics.mean(latencies) * 1000:7.3f} ms   "
+          f"p50 {percentile(latencies, 50) * 1000:7.3f} ms   p99 {percentile(latencies, 99) * 1000:7.3f} ms")
+    session_data = dashboard.get_device(dashboard.DEFAULT_DEVICE_ID).session_data
+    print(f"session records enriched: "
+          f"{sum(1 for r in session_data.rows() if r['latitude'] is not None)}/{len(session_data)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POST /data latency with slow geolocation/VPN upstreams")
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--upstream-delay", type=float, default=0.5, help="seconds per upstream call")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between samples")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.samples, args.upstream_delay, args.interval))
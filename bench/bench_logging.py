@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.helpers import percentile
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+
+class SlowStream:
+    # Stands in for a console or pipe that blocks on write (terminal, journald, a full pipe)
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def use_sync_handlers(tmp, devnull):
+    # The old setup: basicConfig-style handlers writing from the event loop thread
+    dashboard.stop_logging()
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [logging.StreamHandler(devnull), logging.FileHandler(os.path.join(tmp, "sync.log"))]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    root = logging.getLogger()
+    root.handlers[:] = handlers
+    root.setLevel(logging.DEBUG)
+
+
+def use_queued_handlers(tmp, devnull, rate_limit):
+    dashboard.LOG_RATE_LIMIT = rate_limit
+    dashboard.setup_logging(logging.DEBUG, os.path.join(tmp, f"queued_{rate_limit}.log"), devnull)
+
+
+async def ingest(client, samples):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(samples):
+        body = {"status": "data", "public_ip": "198.51.100.9", "temperature": 21.5, "humidity": 40.0, "speed": i % 100, "remaining": i}
+        sent = time.perf_counter()
+        await (await client.post("/data", json=body)).read()
+        latencies.append(time.perf_counter() - sent)
+    return samples / (time.perf_counter() - start), latencies
+
+
+async def run(samples, sink_delay):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as null:
+        devnull = SlowStream(null, sink_delay)
+        configs = [
+            ("sync handlers", lambda: use_sync_handlers(tmp, devnull)),
+            ("queue, no limit", lambda: use_queued_handlers(tmp, devnull, 0)),
+            ("queue, limited", lambda: use_queued_handlers(tmp, devnull, 20)),
+        ]
+        try:
+            await ingest(client, 200)
+            for name, configure in configs:
+                configure()
+                rate, latencies = await ingest(client, samples)
+                print(f"{name:<16} {rate:8,.0f} samples/s   mean {statistics.mean(latencies) * 1000:6.3f} ms   "
+                      f"p99 {percentile(latencies, 99) * 1000:6.3f} ms")
+        finally:
+            await client.close()
+            await stub_runner.cleanup()
+            dashboard.stop_logging()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest throughput with DEBUG logging: synchronous vs queued handlers")
+    parser.add_argument("--samples", type=int, default=3000)
+    parser.add_argument("--sink-delay", type=float, default=0.0, help="seconds each console write blocks")
+    args = parser.parse_args()
+    print(f"console write delay {args.sink_delay * 1000:.2f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.samples, args.sink_delay))
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+async def ingest_rate(instrumented, samples):
+    app = await dashboard.init_app()
+    if not instrumented:
+        app.middlewares.remove(dashboard.metrics_middleware)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    try:
+        body = {"status": "data", "public_ip": "198.51.100.9", "temperature": 21.5, "humidity": 40.0, "speed": 50, "remaining": 1}
+        for _ in range(200):
+            await (await client.post("/data", json=body)).read()
+        start = time.perf_counter()
+        for _ in range(samples):
+            await (await client.post("/data", json=body)).read()
+        return samples / (time.perf_counter() - start)
+    finally:
+        await client.close()
+
+
+async def run(samples, rounds):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    try:
+        rates = {True: [], False: []}
+        # Alternate the two setups so machine noise hits both alike
+        for _ in range(rounds):
+            for instrumented in (False, True):
+                rates[instrumented].append(await ingest_rate(instrumented, samples))
+    finally:
+        await stub_runner.cleanup()
+    plain, instrumented = max(rates[False]), max(rates[True])
+    print(f"without middleware {plain:8,.0f} samples/s")
+    print(f"with middleware    {instrumented:8,.0f} samples/s   ({(instrumented / plain - 1) * 100:+.1f}%)")
+
+    histogram = dashboard.Metric("bench_seconds", "bench", "histogram", ("route", "status"), dashboard.LATENCY_BUCKETS)
+    observe = min(timeit.repeat(lambda: histogram.observe(0.0042, "/data", "data"), number=100_000, repeat=5)) / 100_000
+    print(f"Metric.observe     {observe * 1e9:8.0f} ns per call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest throughput with and without the metrics middleware")
+    parser.add_argument("--samples", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.samples, args.rounds))
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+
+logging.getLogger().setLevel(logging.WARNING)
+
+BROWSER_HEADERS = {"Accept-Encoding": "gzip, deflate, br"}
+
+
+def inline_page():
+    # The page as it used to be served: CSS and JS inlined, re-encoded on every request
+    html = dashboard.HTML_CONTENT
+    html = html.replace(f'<link href="{dashboard.dashboard_css.url}" rel="stylesheet">', f"<style>{dashboard.DASHBOARD_CSS}</style>")
+    return html.replace(f'<script src="{dashboard.dashboard_js.url}"></script>', f"<script>{dashboard.DASHBOARD_JS}</script>")
+
+
+async def page_load(client, urls, etags):
+    # One browser page load: the document plus its assets, revalidating what it already holds
+    transferred = 0
+    for url in urls:
+        headers = dict(BROWSER_HEADERS)
+        if url in etags:
+            headers["If-None-Match"] = etags[url]
+        response = await client.get(url, headers=headers, auto_decompress=False)
+        transferred += len(await response.read())
+        if "ETag" in response.headers:
+            etags[url] = response.headers["ETag"]
+    return transferred
+
+
+async def measure(client, urls, loads, repeat):
+    etags = {}
+    if repeat:
+        await page_load(client, urls, etags)
+    transferred = 0
+    start = time.perf_counter()
+    for _ in range(loads):
+        transferred += await page_load(client, urls, etags if repeat else {})
+    return (time.perf_counter() - start) / loads, transferred / loads
+
+
+async def run(loads):
+    app = await dashboard.init_app()
+    legacy_page = inline_page()
+
+    async def handle_legacy_root(request):
+        return web.Response(text=legacy_page, content_type='text/html')
+
+    app.router.add_get('/legacy', handle_legacy_root)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    try:
+        # Repeat visits still pay for the whole page: the legacy route sends no validators
+        legacy = await measure(client, ["/legacy"], loads, repeat=False)
+        assets = ["/", dashboard.dashboard_css.url, dashboard.dashboard_js.url]
+        first = await measure(client, assets, loads, repeat=False)
+        # Hashed assets are immutable, so a browser only revalidates the document itself
+        repeat = await measure(client, ["/"], loads, repeat=True)
+    finally:
+        await client.close()
+
+    print(f"{loads} page loads, Accept-Encoding: {BROWSER_HEADERS['Accept-Encoding']} (brotli {'on' if dashboard.brotli else 'not installed'})")
+    for name, (elapsed, transferred) in (("inline, uncompressed", legacy), ("first visit", first), ("repeat visit", repeat)):
+        print(f"{name:<22} {elapsed * 1000:7.3f} ms/load   {transferred:9,.0f} B/load")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bytes and time per dashboard page load, inline vs precompressed assets")
+    parser.add_argument("--loads", type=int, default=500)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.loads))
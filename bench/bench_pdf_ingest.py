@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from report import generate_pdf
+from bench.helpers import percentile
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+COORDS = {"latitude": -1.292066, "longitude": 36.821945, "source": "google_geolocation", "accuracy": 120}
+
+
+async def ingest_while(client, busy, interval):
+    latencies = []
+    body = {"status": "data", "public_ip": "198.51.100.1", "temperature": 21.5, "humidity": 40.0, "speed": 50, "remaining": 10}
+    while not busy.done():
+        start = time.perf_counter()
+        response = await client.post('/data', json=body)
+        await response.read()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def render_inline():
+    # The old behaviour: generate_pdf called directly on the event loop
+    await asyncio.sleep(0)
+    device = dashboard.get_device(dashboard.DEFAULT_DEVICE_ID)
+    generate_pdf(device.session_data, device.gps_coords)
+
+
+async def render_in_pool(client):
+    response = await client.get('/download_pdf')
+    while response.status == 202:
+        await asyncio.sleep(0.2)
+        response = await client.get((await response.json())["poll"])
+    await response.read()
+
+
+def report(name, latencies, elapsed):
+    print(f"{name:<8} render {elapsed:6.2f}s   {len(latencies):4d} ingests   "
+          f"p50 {percentile(latencies, 50) * 1000:8.2f} ms   p99 {percentile(latencies, 99) * 1000:8.2f} ms   "
+          f"max {max(latencies) * 1000:8.2f} ms")
+
+
+async def run(rows, interval):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    device = dashboard.get_device(dashboard.DEFAULT_DEVICE_ID)
+    start_ts = time.time() - rows
+    for i in range(rows):
+        device.session_data.append(start_ts + i, {"temperature": 20 + i % 7, "humidity": 45.0, "speed": i % 100, "remaining": rows - i}, COORDS)
+    device.gps_coords = dict(COORDS)
+    try:
+        # Warm the worker process so the first import of matplotlib is not measured
+        await render_in_pool(client)
+        for name, render in (("inline", render_inline), ("pool", lambda: render_in_pool(client))):
+            start = time.perf_counter()
+            busy = asyncio.ensure_future(render())
+            latencies = await ingest_while(client, busy, interval)
+            await busy
+            report(name, latencies, time.perf_counter() - start)
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POST /data latency while a PDF report renders")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        asyncio.run(run(args.rows, args.interval))
@@ -0,0 +1,47 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+import report
+
+logging.getLogger().setLevel(logging.WARNING)
+
+COORDS = {"latitude": -1.292066, "longitude": 36.821945, "source": "google_geolocation", "accuracy": 120}
+
+
+def build_session(rows):
+    rng = np.random.default_rng(3)
+    store = dashboard.SessionStore()
+    start_ts = time.time() - rows
+    temperature = 22 + rng.normal(0, 0.5, rows)
+    temperature[rows // 2] = 60.0  # a single-sample spike that must stay visible
+    humidity = 45 + rng.normal(0, 2, rows)
+    store.columns["timestamp"].extend(start_ts + np.arange(rows, dtype=np.float64))
+    store.columns["temperature"].extend(temperature)
+    store.columns["humidity"].extend(humidity)
+    store.columns["speed"].extend(rng.integers(0, 100, rows).tolist())
+    store.columns["remaining"].extend(range(rows, 0, -1))
+    store.location_runs.append((0, tuple(COORDS.values())))
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chart render time of generate_pdf vs session length")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    args = parser.parse_args()
+
+    for rows in (int(size) for size in args.sizes.split(",")):
+        store = build_session(rows)
+        values = np.array(store.column("temperature"))
+        _, kept = report.downsample_minmax(np.arange(rows), values, report.PDF_PLOT_POINTS)
+        start = time.perf_counter()
+        report.render_session_charts(store)
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>9} samples   chart render {elapsed:6.2f}s   "
+              f"{len(kept)} points plotted per series   spike kept: {kept.max() == 60.0}")
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+# Frame cost has to be measured in a browser: this serves one device with a long
+# history window and keeps it fed, for the page to be opened with ?perf. The page
+# then logs "render: N frames, P points, mean/p95/max ms" to the console.
+
+
+def sample(i, runtime):
+    return {
+        "temperature": round(22 + 3 * math.sin(i / 50), 2),
+        "humidity": round(45 + 5 * math.cos(i / 80), 2),
+        "speed": i % 100,
+        "remaining": max(runtime - i, 0)
+    }
+
+
+async def feed(base_url, device_id, rate, duration, start_index, runtime):
+    async with ClientSession() as session:
+        url = f"{base_url}/devices/{device_id}/data"
+        deadline = time.perf_counter() + duration
+        i = start_index
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with session.post(url, json={"status": "data", "public_ip": "Unknown", **sample(i, runtime)}) as response:
+                await response.read()
+            i += 1
+            await asyncio.sleep(max(0.0, 1 / rate - (time.perf_counter() - started)))
+
+
+async def run(args):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    dashboard.MAX_HISTORY = args.history
+    runner = web.AppRunner(await dashboard.init_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, args.host, args.port)
+    await site.start()
+    try:
+        device = dashboard.get_device(args.device, create=True)
+        device.state = "running"
+        device.data_received = True
+        now = time.time() - args.history
+        runtime = args.history + int(args.rate * args.duration)
+        for i in range(args.history):
+            dashboard.append_sample(device, now + i, sample(i, runtime))
+        page_url = f"http://{args.host}:{args.port}/?device={args.device}&perf"
+        print(f"{args.history} points in the window, {len(device.snapshot_body())} B snapshot; "
+              f"feeding {args.rate:g} samples/s for {args.duration:g}s")
+        print(f"open {page_url} and watch the console")
+        await feed(f"http://{args.host}:{args.port}", args.device, args.rate, args.duration, args.history, runtime)
+    finally:
+        await runner.cleanup()
+        await stub_runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a device with a large MAX_HISTORY for measuring page frame cost")
+    parser.add_argument("--history", type=int, default=20000, help="MAX_HISTORY for the run, pre-filled")
+    parser.add_argument("--rate", type=float, default=10, help="live samples per second")
+    parser.add_argument("--duration", type=float, default=300)
+    parser.add_argument("--device", default="perf")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args))
@@ -0,0 +1,63 @@
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+COORDS = {"latitude": -1.292066, "longitude": 36.821945, "source": "google_geolocation", "accuracy": 120}
+
+
+def write_log(log, count, batch_size):
+    # What a session writes in production: each sample goes through append_sample and
+    # then through the enrichment re-stamp of its row (a cache hit with the same coords)
+    rng = random.Random(7)
+    dashboard.session_log = log
+    device = dashboard.Device(dashboard.DEFAULT_DEVICE_ID)
+    device.gps_coords = dict(COORDS)
+    dashboard.journal(device, {"e": "setup", "auth_code": 123, "runtime": count})
+    start_ts = time.time() - count
+    commits = 0
+    start = time.perf_counter()
+    for i in range(count):
+        row, _ = dashboard.append_sample(device, start_ts + i, {
+            "temperature": round(rng.uniform(18, 30), 1), "humidity": round(rng.uniform(30, 70), 1),
+            "speed": rng.randint(0, 100), "remaining": count - i})
+        dashboard.restamp_location(device, device.session_data, row, COORDS)
+        if len(log.pending) >= batch_size:
+            log.write_batch(*log.take_batch())
+            commits += 1
+    log.write_batch(*log.take_batch())
+    elapsed = time.perf_counter() - start
+    return elapsed, commits + 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session log group-commit cost and crash-recovery time")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000, help="entries per group commit (fsync)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_log.jsonl")
+        log = dashboard.SessionLog(path)
+        elapsed, commits = write_log(log, args.samples, args.batch)
+        log.close()
+        size = os.path.getsize(path)
+        print(f"wrote {args.samples} samples in {elapsed:.2f}s with {commits} fsyncs "
+              f"({elapsed / args.samples * 1e6:.2f} us/sample, {size / args.samples:.1f} B/sample on disk)")
+
+        dashboard.session_log = dashboard.SessionLog(path)
+        start = time.perf_counter()
+        dashboard.recover_session()
+        recovery = time.perf_counter() - start
+        device = dashboard.get_device(dashboard.DEFAULT_DEVICE_ID)
+        print(f"replayed {args.samples} samples in {recovery:.2f}s ({args.samples / recovery:,.0f} samples/s), "
+              f"kept {len(device.session_data)}, state: {device.state}")
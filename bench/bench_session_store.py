@@ -0,0 +1,70 @@
+import argparse
+import datetime
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard import SessionStore, METRIC_FIELDS
+
+COORDS = {"latitude": -1.292066, "longitude": 36.821945, "source": "google_geolocation", "accuracy": 120}
+
+
+def make_samples(count):
+    rng = random.Random(42)
+    start = time.time()
+    for i in range(count):
+        yield start + i, {
+            "temperature": round(rng.uniform(18, 30), 1),
+            "humidity": round(rng.uniform(30, 70), 1),
+            "speed": rng.randint(0, 100),
+            "remaining": count - i
+        }
+
+
+def fill_list_of_dicts(samples):
+    # The pre-columnar layout: one dict per sample with a formatted timestamp string
+    session = []
+    for ts, sample in samples:
+        session.append({
+            "timestamp": datetime.datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
+            **{k: sample[k] for k in METRIC_FIELDS},
+            **COORDS
+        })
+    return session
+
+
+def fill_session_store(samples):
+    store = SessionStore()
+    for ts, sample in samples:
+        store.append(ts, sample, COORDS)
+    return store
+
+
+def measure(name, fill, count):
+    samples = list(make_samples(count))
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    session = fill(samples)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<16} {current / 1024 / 1024:8.2f} MiB   {current / count:7.1f} B/sample   "
+          f"append {elapsed / count * 1e6:6.2f} us/sample")
+    return session, current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory per sample: list of dicts vs columnar SessionStore")
+    parser.add_argument("--samples", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.samples} samples")
+    _, dict_bytes = measure("list of dicts", fill_list_of_dicts, args.samples)
+    store, store_bytes = measure("SessionStore", fill_session_store, args.samples)
+    print(f"SessionStore uses {dict_bytes / store_bytes:.1f}x less memory "
+          f"(nbytes estimate {store.nbytes() / 1024 / 1024:.2f} MiB)")
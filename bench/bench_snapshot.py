@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def rebuild_every_time(device):
+    # The old behaviour: a fresh dict and a stdlib json pass on every GET
+    def snapshot_body(content_type="application/json", since=None):
+        if not device.can_send_delta(since):
+            since = None
+        return json.dumps(device.snapshot(since)).encode()
+    device.snapshot_body = snapshot_body
+
+
+async def writer(client, stop):
+    i = 0
+    while not stop.is_set():
+        body = {"status": "data", "temperature": 20 + i % 10, "humidity": 45.0, "speed": i % 100, "remaining": i}
+        await (await client.post("/data", json=body)).read()
+        i += 1
+        await asyncio.sleep(1)
+
+
+async def poller(client, stop, counter):
+    while not stop.is_set():
+        response = await client.get("/data")
+        await response.read()
+        # An error path must not pass for a fast GET
+        if response.status not in (200, 304):
+            raise RuntimeError(f"GET /data failed with {response.status}")
+        counter[0] += 1
+
+
+async def measure(client, viewers, duration):
+    stop = asyncio.Event()
+    counter = [0]
+    cpu, wall = time.process_time(), time.perf_counter()
+    tasks = [asyncio.ensure_future(writer(client, stop))]
+    tasks += [asyncio.ensure_future(poller(client, stop, counter)) for _ in range(viewers)]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return counter[0], time.process_time() - cpu, time.perf_counter() - wall
+
+
+async def run(viewer_counts, duration, history):
+    dashboard.MAX_HISTORY = history
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+    device = dashboard.get_device(dashboard.DEFAULT_DEVICE_ID)
+    device.history = dashboard.HistoryBuffer(history)
+    for i in range(history):
+        await (await client.post("/data", json={"status": "data", "temperature": 21.5, "humidity": 40.0, "speed": i, "remaining": i})).read()
+    encoder = "orjson" if dashboard.orjson is not None else "json"
+    try:
+        for mode in ("rebuild", "cached"):
+            if mode == "rebuild":
+                rebuild_every_time(device)
+            else:
+                del device.snapshot_body
+            for viewers in viewer_counts:
+                gets, cpu, wall = await measure(client, viewers, duration)
+                print(f"{mode:<8} {viewers:4d} viewers   {gets / wall:8,.0f} GET/s   "
+                      f"{cpu / gets * 1e6:7.1f} us CPU per GET (client and server, {'json' if mode == 'rebuild' else encoder})")
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CPU per GET /data with many viewers: rebuilt vs cached snapshot")
+    parser.add_argument("--viewers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--history", type=int, default=300, help="history points in each snapshot")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+        asyncio.run(run(args.viewers, args.duration, args.history))
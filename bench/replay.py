@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aiohttp.test_utils import TestServer, TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard
+from bench.upstream_stub import start_stub_server, point_dashboard_at
+
+logging.getLogger().setLevel(logging.WARNING)
+
+# Session log state events turned back into the POST that caused them
+STATE_STATUSES = {"ready": "arduino_ready", "running": "start", "stopped": "stopped"}
+
+
+def open_capture(path):
+    # Read line by line so multi-GB captures never sit in memory; .gz is decompressed on the fly
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb", buffering=1 << 20)
+
+
+def read_bodies(path):
+    # One record per line, either the exact body handle_data received or
+    # {"ts": <unix seconds>, "body": {...}, "device_id": ...} with the arrival time.
+    # Yields (ts or None, device_id or None, encoded body).
+    with open_capture(path) as capture:
+        for line in capture:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "body" in record:
+                body = record["body"]
+                yield record.get("ts"), record.get("device_id"), json.dumps(body).encode() if not isinstance(body, str) else body.encode()
+            else:
+                # Raw bodies are forwarded byte for byte
+                yield None, record.get("device_id"), line
+
+
+def read_session_log(path):
+    # The server's own session log: samples become status=data posts, state changes
+    # their protocol status; enrichment and reset entries are skipped. Only samples
+    # carry a timestamp, so only they are paced by --speed: a state change goes out
+    # right after the sample before it, which keeps the recorded order.
+    session_log = dashboard.SessionLog(path)
+    for entry in session_log.entries():
+        if isinstance(entry, tuple):
+            device_id, ts, temperature, humidity, speed, remaining = entry
+            body = {"status": "data", "temperature": temperature, "humidity": humidity, "speed": speed, "remaining": remaining}
+            yield ts, device_id, json.dumps(body).encode()
+        elif entry.get("e") == "state" and entry.get("state") in STATE_STATUSES:
+            yield None, entry.get("d"), json.dumps({"status": STATE_STATUSES[entry["state"]]}).encode()
+
+
+def sample_count(body):
+    if b'"data"' in body:
+        return 1
+    if b'"batch"' in body:
+        try:
+            return len(json.loads(body).get("samples", ()))
+        except ValueError:
+            return 0
+    return 0
+
+
+class Replay:
+    def __init__(self, post, workers):
+        self.post = post
+        # One queue per worker and a device always maps to the same worker, so each
+        # device's posts arrive in recorded order while devices run concurrently
+        self.queues = [asyncio.Queue(maxsize=1000) for _ in range(workers)]
+        self.requests = 0
+        self.samples = 0
+        self.statuses = {}
+        self.max_behind = 0.0
+
+    async def worker(self, queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            path, body, due = item
+            if due is not None:
+                self.max_behind = max(self.max_behind, time.perf_counter() - due)
+            status = await self.post(path, body)
+            self.requests += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.samples += sample_count(body)
+
+    async def run(self, records, speed):
+        workers = [asyncio.create_task(self.worker(queue)) for queue in self.queues]
+        start = time.perf_counter()
+        first_ts = None
+        for ts, device_id, body in records:
+            due = None
+            if speed and ts is not None:
+                if first_ts is None:
+                    first_ts = ts
+                due = start + (ts - first_ts) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            path = f"/devices/{device_id}/data" if device_id else "/data"
+            queue = self.queues[zlib.crc32((device_id or "").encode()) % len(self.queues)]
+            await queue.put((path, body, due))
+        for queue in self.queues:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        return time.perf_counter() - start
+
+
+async def replay_in_process(records, args):
+    stub_runner, base_url = await start_stub_server()
+    point_dashboard_at(dashboard, base_url)
+    dashboard.MAX_DEVICES = max(dashboard.MAX_DEVICES, 10000)
+    client = TestClient(TestServer(await dashboard.init_app()))
+    await client.start_server()
+
+    async def post(path, body):
+        async with client.post(path, data=body, headers={"Content-Type": "application/json"}) as response:
+            await response.read()
+            return response.status
+
+    try:
+        replay = Replay(post, args.workers)
+        elapsed = await replay.run(records, args.speed)
+    finally:
+        await client.close()
+        await stub_runner.cleanup()
+    return replay, elapsed
+
+
+async def replay_to_url(records, args):
+    base_url = args.url.rstrip("/")
+    async with ClientSession(connector=TCPConnector(limit=args.workers), timeout=ClientTimeout(total=30)) as session:
+        async def post(path, body):
+            async with session.post(base_url + path, data=body, headers={"Content-Type": "application/json"}) as response:
+                await response.read()
+                return response.status
+
+        replay = Replay(post, args.workers)
+        elapsed = await replay.run(records, args.speed)
+    return replay, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded telemetry into a dashboard at N x speed")
+    parser.add_argument("capture", help="JSONL of POST bodies or {ts, body, device_id} records (.gz accepted)")
+    parser.add_argument("--session-log", action="store_true", help="capture is a server session_log.jsonl")
+    parser.add_argument("--url", help="base URL of a running server; omitted, the app is started in-process")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale for recorded timestamps; 0 = as fast as possible")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent posts (per-device order is kept)")
+    args = parser.parse_args()
+
+    records = read_session_log(args.capture) if args.session_log else read_bodies(args.capture)
+    if args.url:
+        replay, elapsed = asyncio.run(replay_to_url(records, args))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            dashboard.session_log = dashboard.SessionLog(os.path.join(tmp, "session_log.jsonl"))
+            replay, elapsed = asyncio.run(replay_in_process(records, args))
+
+    print(f"{replay.requests} posts in {elapsed:.2f}s ({replay.requests / elapsed:,.0f} req/s), "
+          f"{replay.samples} samples accepted ({replay.samples / elapsed:,.0f} samples/s)")
+    print("statuses        " + ", ".join(f"{status}: {count}" for status, count in sorted(replay.statuses.items())))
+    if args.speed:
+        print(f"max lag behind the recorded schedule {replay.max_behind * 1000:.1f} ms")
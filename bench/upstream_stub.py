@@ -0,0 +1,41 @@
+import asyncio
+
+from aiohttp import web
+
+
+def create_stub_app(delay=0.0):
+    async def stub_ip_api(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({
+            "status": "success",
+            "proxy": False,
+            "hosting": False,
+            "org": "Stub Telecom",
+            "lat": -1.2921,
+            "lon": 36.8219
+        })
+
+    async def stub_geolocate(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"location": {"lat": -1.2921, "lng": 36.8219}, "accuracy": 120})
+
+    app = web.Application()
+    app.router.add_get('/json/{ip}', stub_ip_api)
+    app.router.add_post('/geolocate', stub_geolocate)
+    return app
+
+
+async def start_stub_server(delay=0.0):
+    runner = web.AppRunner(create_stub_app(delay), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def point_dashboard_at(dashboard, base_url):
+    dashboard.IP_API_URL = f"{base_url}/json"
+    dashboard.GOOGLE_GEOLOCATION_URL = f"{base_url}/geolocate"
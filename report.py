@@ -0,0 +1,218 @@
+# Session report rendering. Imported only by the PDF worker processes (see
+# dashboard.render_report), so the web process never pays for loading
+# matplotlib, numpy and reportlab.
+import datetime
+import io
+import logging
+import os
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.styles import getSampleStyleSheet
+from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+
+PDF_PLOT_POINTS = int(os.environ.get("PDF_PLOT_POINTS", 2000))
+PDF_DETAIL_ROW_LIMIT = int(os.environ.get("PDF_DETAIL_ROW_LIMIT", 5000))
+PDF_TABLE_CHUNK_ROWS = 40
+MINUTE_COLUMNS = [("temperature", ".1f"), ("humidity", ".1f"), ("speed", ".0f"), ("remaining", ".0f")]
+
+def downsample_minmax(x, y, target_points):
+    # Min/max bucketing: keep the lowest and highest sample of each bucket so spikes
+    # survive, with bucket boundaries computed in one vectorized pass
+    n = len(y)
+    buckets = max(target_points // 2, 1)
+    if n <= target_points:
+        return x, y
+    size = -(-n // buckets)
+    padded = np.concatenate([y, np.repeat(y[-1:], buckets * size - n)]).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picks = np.concatenate([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)])
+    picks = np.unique(np.minimum(picks, n - 1))
+    return x[picks], y[picks]
+
+def time_order(session_data):
+    # Rows are stored in arrival order, and a batch can carry backdated samples: reports
+    # read them by timestamp. Stable, so samples sharing a timestamp keep arrival order.
+    # Returns the sorted timestamps and the row order, None when already in time order.
+    timestamps = np.array(session_data.column("timestamp"), dtype=np.float64)
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        return timestamps, None
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], order
+
+def ordered_column(session_data, key, order):
+    values = np.array(session_data.column(key), dtype=np.float64)
+    return values if order is None else values[order]
+
+def render_session_charts(session_data):
+    timestamps, order = time_order(session_data)
+    times = (timestamps * 1000).astype("datetime64[ms]")
+    local_tz = datetime.datetime.now().astimezone().tzinfo
+    series = [
+        ("temperature", "Temperature", "Temperature Variation", "Temperature (°C)", "red"),
+        ("humidity", "Humidity", "Humidity Variation", "Humidity (%)", "blue"),
+        ("speed", "Speed", "Speed Variation", "Speed (%)", "green"),
+        ("remaining", "Time Remaining", "Time Remaining Variation", "Time (s)", "purple")
+    ]
+
+    figure, axes = plt.subplots(4, 1, figsize=(10, 8), sharex=True)
+    for ax, (key, label, title, ylabel, color) in zip(axes, series):
+        values = ordered_column(session_data, key, order)
+        x, y = downsample_minmax(times, values, PDF_PLOT_POINTS)
+        ax.plot(x, y, label=label, color=color, linewidth=1)
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+        ax.legend()
+    locator = mdates.AutoDateLocator(tz=local_tz)
+    axes[-1].xaxis.set_major_locator(locator)
+    axes[-1].xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S", tz=local_tz))
+    axes[-1].set_xlabel('Time')
+    plt.setp(axes[-1].get_xticklabels(), rotation=45)
+
+    figure.tight_layout()
+    canvas = FigureCanvas(figure)
+    img_buffer = io.BytesIO()
+    canvas.print_png(img_buffer)
+    plt.close(figure)
+    img_buffer.seek(0)
+    plt_img = Image(img_buffer)
+    plt_img.drawWidth = 500
+    plt_img.drawHeight = 400
+    return plt_img
+
+DETAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+])
+
+def chunked_tables(header, rows, col_widths):
+    # One small fixed-width Table per page instead of a single Table holding every
+    # row: reportlab never has to measure or split a huge table
+    chunk = [header]
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) > PDF_TABLE_CHUNK_ROWS:
+            yield Table(chunk, colWidths=col_widths, style=DETAIL_TABLE_STYLE)
+            chunk = [header]
+    if len(chunk) > 1:
+        yield Table(chunk, colWidths=col_widths, style=DETAIL_TABLE_STYLE)
+
+def detail_rows(session_data):
+    _, order = time_order(session_data)
+    rows = session_data.rows()
+    if order is not None:
+        arrived = list(rows)
+        rows = (arrived[i] for i in order)
+    for entry in rows:
+        yield [
+            entry["timestamp"],
+            f"{entry['temperature']:.1f}",
+            f"{entry['humidity']:.1f}",
+            f"{entry['speed']}",
+            f"{entry['remaining']}",
+            f"{entry['latitude']:.6f}" if entry['latitude'] else "N/A",
+            f"{entry['longitude']:.6f}" if entry['longitude'] else "N/A"
+        ]
+
+def minute_rows(session_data):
+    timestamps, order = time_order(session_data)
+    minutes = np.floor(timestamps / 60).astype(np.int64)
+    # Sorted by time, so each minute is one contiguous run
+    starts = np.flatnonzero(np.diff(minutes, prepend=minutes[0] - 1))
+    counts = np.diff(np.append(starts, len(minutes)))
+    stats = {}
+    for key, _ in MINUTE_COLUMNS:
+        values = ordered_column(session_data, key, order)
+        stats[key] = (
+            np.minimum.reduceat(values, starts),
+            np.add.reduceat(values, starts) / counts,
+            np.maximum.reduceat(values, starts)
+        )
+    for i, start in enumerate(starts):
+        label = datetime.datetime.fromtimestamp(int(minutes[start]) * 60).strftime("%H:%M")
+        row = [label, str(counts[i])]
+        for key, fmt in MINUTE_COLUMNS:
+            low, mean, high = (column[i] for column in stats[key])
+            row.append(f"{low:{fmt}} / {mean:.1f} / {high:{fmt}}")
+        yield row
+
+def generate_pdf(session_data, gps_coords, filename=None, detail="auto"):
+    if filename is None:
+        filename = f"aerospin_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    elements.append(Paragraph("Aerospin Session Report", styles['Title']))
+    elements.append(Paragraph(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    if gps_coords["latitude"] and gps_coords["longitude"]:
+        elements.append(Paragraph(
+            f"Device Location: Lat {gps_coords['latitude']:.6f}, Lon {gps_coords['longitude']:.6f} "
+            f"(Source: {gps_coords['source']}, Accuracy: {gps_coords['accuracy']}m)",
+            styles['Normal']
+        ))
+    elements.append(Spacer(1, 12))
+
+    if not session_data:
+        elements.append(Paragraph("No data collected during this session", styles['Normal']))
+        doc.build(elements)
+        return filename
+
+    temperatures = np.array(session_data.column("temperature"), dtype=np.float64)
+    humidities = np.array(session_data.column("humidity"), dtype=np.float64)
+    speeds = np.array(session_data.column("speed"), dtype=np.int64)
+    remainings = np.array(session_data.column("remaining"), dtype=np.int64)
+
+    summary_data = [
+        ["Metric", "Minimum", "Maximum", "Average"],
+        ["Temperature (°C)", f"{temperatures.min():.1f}", f"{temperatures.max():.1f}", f"{temperatures.mean():.1f}"],
+        ["Humidity (%)", f"{humidities.min():.1f}", f"{humidities.max():.1f}", f"{humidities.mean():.1f}"],
+        ["Speed (%)", f"{speeds.min()}", f"{speeds.max()}", f"{speeds.mean():.1f}"],
+        ["Time Remaining (s)", f"{remainings.min()}", f"{remainings.max()}", f"{remainings.mean():.1f}"]
+    ]
+    
+    summary_table = Table(summary_data)
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(Paragraph("Summary Statistics", styles['Heading2']))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Graphical Analysis", styles['Heading2']))
+    elements.append(render_session_charts(session_data))
+
+    if detail == "auto":
+        detail = "rows" if len(session_data) <= PDF_DETAIL_ROW_LIMIT else "minutes"
+    if detail == "rows":
+        elements.append(Paragraph("Detailed Session Data", styles['Heading2']))
+        header = ["Timestamp", "Temp (°C)", "Humidity (%)", "Speed (%)", "Remaining (s)", "Latitude", "Longitude"]
+        elements.extend(chunked_tables(header, detail_rows(session_data), [58, 58, 66, 58, 72, 78, 78]))
+    else:
+        elements.append(Paragraph("Per-Minute Session Data", styles['Heading2']))
+        elements.append(Paragraph(
+            f"{len(session_data)} samples aggregated per minute; cells show min / mean / max.",
+            styles['Normal']
+        ))
+        header = ["Minute", "Samples", "Temp (°C)", "Humidity (%)", "Speed (%)", "Remaining (s)"]
+        elements.extend(chunked_tables(header, minute_rows(session_data), [48, 48, 96, 96, 90, 90]))
+
+    doc.build(elements)
+    logging.info("PDF generated: %s", filename)
+    return filename